@@ -96,9 +96,9 @@ def upload_files():
         os.remove(base_cp_path)
         os.remove(recap_path)
         
-        return render_template('results.html', 
+        return render_template('results.html',
                              session_id=session_id,
-                             changes=changes,
+                             changes=[change._asdict() for change in changes],
                              change_summary=change_summary,
                              merged_content=merged_document[:2000] + "..." if len(merged_document) > 2000 else merged_document)
         
@@ -1,25 +1,39 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, NamedTuple
 from datetime import datetime
 import difflib
 
+class Change(NamedTuple):
+    """A single tracked modification to the merged document
+
+    A NamedTuple rather than a dict: records are immutable, far smaller,
+    and field access compiles down to a tuple index.
+    """
+    id: int
+    field: str
+    old_value: str
+    new_value: str
+    description: str
+    timestamp: str
+    change_type: str
+
 class ChangeTracker:
     """Tracks and manages changes made during document merging"""
-    
+
     def __init__(self):
         self.changes = []
-    
-    def track_change(self, field: str, old_value: str, new_value: str, description: str) -> Dict[str, Any]:
+
+    def track_change(self, field: str, old_value: str, new_value: str, description: str) -> Change:
         """Track a single change"""
-        change = {
-            'id': len(self.changes) + 1,
-            'field': field,
-            'old_value': old_value,
-            'new_value': new_value,
-            'description': description,
-            'timestamp': datetime.now().isoformat(),
-            'change_type': self._determine_change_type(old_value, new_value)
-        }
-        
+        change = Change(
+            id=len(self.changes) + 1,
+            field=field,
+            old_value=old_value,
+            new_value=new_value,
+            description=description,
+            timestamp=datetime.now().isoformat(),
+            change_type=self._determine_change_type(old_value, new_value)
+        )
+
         self.changes.append(change)
         return change
     
@@ -45,7 +59,7 @@ class ChangeTracker:
         )
         return list(differ)
     
-    def generate_summary(self, changes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def generate_summary(self, changes: List[Change]) -> Dict[str, Any]:
         """Generate a comprehensive summary of all changes"""
         if not changes:
             return {
@@ -65,15 +79,15 @@ class ChangeTracker:
         fields_modified = set()
         
         for change in changes:
-            change_type = change['change_type']
+            change_type = change.change_type
             if change_type == 'addition':
                 change_types['additions'] += 1
             elif change_type == 'modification':
                 change_types['modifications'] += 1
             elif change_type == 'deletion':
                 change_types['deletions'] += 1
-            
-            fields_modified.add(change['field'])
+
+            fields_modified.add(change.field)
         
         # Generate summary text
         summary_parts = []
@@ -94,16 +108,16 @@ class ChangeTracker:
             'timestamp': datetime.now().isoformat()
         }
     
-    def format_change_for_display(self, change: Dict[str, Any]) -> Dict[str, Any]:
+    def format_change_for_display(self, change: Change) -> Dict[str, Any]:
         """Format a change for display in the UI"""
         return {
-            'id': change['id'],
-            'field': self._format_field_name(change['field']),
-            'description': change['description'],
-            'change_type': change['change_type'],
-            'old_value': self._truncate_text(change['old_value'], 200),
-            'new_value': self._truncate_text(change['new_value'], 200),
-            'timestamp': change['timestamp']
+            'id': change.id,
+            'field': self._format_field_name(change.field),
+            'description': change.description,
+            'change_type': change.change_type,
+            'old_value': self._truncate_text(change.old_value, 200),
+            'new_value': self._truncate_text(change.new_value, 200),
+            'timestamp': change.timestamp
         }
     
     def _format_field_name(self, field: str) -> str:
@@ -1,26 +1,267 @@
 import re
 import os
 import logging
-import signal
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from copy import deepcopy
+from functools import lru_cache
+from itertools import repeat
 from typing import Dict, List, Tuple, Any
-try:
-    import pdfplumber
-    import PyPDF2
-    from docx import Document
-    from docx.shared import Inches
-    from reportlab.lib.pagesizes import letter
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    PDF_LIBS_AVAILABLE = True
-    
-    # Reduce logging level for PDF processing to prevent excessive output
-    logging.getLogger('pdfminer').setLevel(logging.ERROR)
-    logging.getLogger('pdfplumber').setLevel(logging.ERROR)
-    
-except ImportError as e:
-    logging.error(f"Missing required libraries: {e}")
-    PDF_LIBS_AVAILABLE = False
+
+from change_tracker import Change
+
+# The PDF and DOCX libraries are imported lazily inside the code paths that
+# need them: pulling reportlab and PyPDF2 in up front costs hundreds of
+# milliseconds of start-up time and tens of MB of memory even for requests
+# that only touch one output format
+
+@lru_cache(maxsize=None)
+def _pdfium():
+    """Import pypdfium2 on first use; None when the fast path is unavailable
+
+    PDFium's C++ engine extracts text several times faster than PyPDF2,
+    which decodes content streams in pure Python.
+    """
+    try:
+        import pypdfium2
+        return pypdfium2
+    except ImportError:
+        return None
+
+# Patterns for key recap information, compiled once at import
+_RECAP_PATTERNS: Dict[str, re.Pattern] = {
+    key: re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    for key, pattern in {
+        'vessel_name': r'MV\s+([A-Z\s\d]+?)(?:\s+ex\s+|IMO|\s+Cyprus)',
+        'imo_number': r'IMO\s+(\d+)',
+        'flag': r'(Cyprus|Liberian|Marshall Islands|Panama)\s+flag',
+        'built_year': r'BLT\s+(\d{4})',
+        'dwt': r'DWT\s+([\d,\']+)',
+        'delivery_port': r'Delivery\s+DLOSP\s+([A-Za-z\s,]+)',
+        'laycan': r'Laycan:\s*([^–\n]+)',
+        'hire_rate': r'at\s+([\d.]+)\s*%\s*bhsi38',
+        'period': r'About\s+(\d+)\s+to\s+about\s+(\d+)\s+months',
+        'optional_period': r'opt\s+about\s+(\d+)\s*[–-]\s*about\s+(\d+)\s+months\s+at\s*\$\s*([\d,]+)',
+        'redelivery_range': r'REDEL\s+DOP\s+1SP\s+WW\s+WITHIN\s+TRADING\s+LIMITS[^+]*',
+        'bunkers_delivery': r'VLSFO\s+ABOUT\s+(\d+)\s+MT\s+AND\s+MGO\s+ABOUT\s+(\d+)\s+MT',
+        'commission': r'Commission:\s*([\d.]+)\s*%?\s*address\s+commission',
+        'charterer': r'LOUIS\s+DREYFUS\s+COMPANY[^+]*',
+        'owner': r'MV\s+LUNAR\s+STAR\s+1\s+SHIPPING\s+COMPANY[^+]*',
+    }.items()
+}
+
+# The two follow-up section searches fused into one alternation, so the recap
+# text is walked once; dispatch happens on whichever named group matched.
+# [^+]* is equivalent to the old .*?(?=\+|$) tail (stop at the first '+' or
+# the end of text) but runs in linear time with no backtracking
+_RECAP_SECTIONS_RE = re.compile(
+    r'TRADING EXCLUSIONS(?P<trading>[^+]*)'
+    r'|Hire payment clause:(?P<hire>.*?)(?=Conversion|For subsequent)',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Line-classification patterns used when generating output documents. The
+# block patterns fold the separate marker/clause/header checks into a single
+# match call per line; the PDF generator styles 'That the...' headers later,
+# so its pattern leaves them in the body flow
+_DOCX_BLOCK_RE = re.compile(r'(?P<marker>===.*)|(?P<clause>\d+\.\s.*)|(?P<header>That the.{43,})')
+_PDF_BLOCK_RE = re.compile(r'(?P<marker>===.*)|(?P<clause>\d+\.\s.*)')
+_LIST_ITEM_RE = re.compile(r'^\d+\)\s|^[a-z]\)\s|^•\s|^-\s')
+
+# Minimum page count before PDF extraction is fanned out to worker processes;
+# below this, process startup overhead outweighs the parallel speedup
+_PARALLEL_PAGE_THRESHOLD = 8
+
+# Minimum recap size before the independent pattern searches run on a thread
+# pool; the C-level scans release the GIL, so threads genuinely overlap, but
+# pool overhead dominates on small recaps
+_PARALLEL_RECAP_THRESHOLD = 16 * 1024
+
+# PDFium emits U+FFFE noncharacters for glyphs it cannot map, and scanned PDFs
+# can carry stray C0 controls; lxml (and therefore python-docx) rejects both,
+# so they are dropped from extracted text before it reaches the generators
+_XML_INCOMPATIBLE_CHARS = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0xFFFE, 0xFFFF]
+)
+
+def _extract_page(file_path: str, page_num: int) -> str:
+    """Extract text from a single PDF page (module-level so it is picklable)"""
+    try:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            page = PyPDF2.PdfReader(file).pages[page_num]
+            return page.extract_text() or ""
+    except Exception:
+        return ""
+
+@lru_cache(maxsize=None)
+def _paragraph_props(style):
+    """Build the shared <w:pPr> template for a paragraph style (cached)
+
+    Callers must deepcopy the returned element before inserting it into a
+    document.
+    """
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    p_pr = OxmlElement('w:pPr')
+    if style:
+        p_style = OxmlElement('w:pStyle')
+        p_style.set(qn('w:val'), style)
+        p_pr.append(p_style)
+    spacing = OxmlElement('w:spacing')
+    spacing.set(qn('w:after'), '120')  # Pt(6) in twentieths of a point
+    p_pr.append(spacing)
+    return p_pr
+
+def _rule(pattern: str) -> re.Pattern:
+    """Compile a merge-rule pattern with the flags the rules share"""
+    return re.compile(pattern, re.IGNORECASE)
+
+# Mapping rules for merging recap data into CP, built once at import with
+# precompiled patterns instead of being reallocated on every merge
+_MERGE_RULES: List[Dict] = [
+    {
+        'field': 'charter_date',
+        'pattern': _rule(r'(made and concluded in\s+\w+\s+)(\d+)(th|st|nd|rd)(\s+day of\s+\w+\s+19\s+)(\d+)'),
+        'replacement': lambda m: f"{m.group(1)}10{m.group(3)}{m.group(4).replace('May', 'June')}2025",
+        'count': 1,
+        'description': 'Updated charter date to June 10, 2025'
+    },
+    {
+        'field': 'vessel_name',
+        'pattern': _rule(r'(Steamship/Motorship\s+")([^"]+)(")'),
+        'replacement': lambda m: f'{m.group(1)}LUNAR STAR 1{m.group(3)}',
+        'recap_field': 'vessel_name',
+        'count': 1,
+        'description': 'Updated vessel name'
+    },
+    {
+        'field': 'owner_details',
+        'pattern': _rule(r'(Between\s+)[^,]+,([^,]+,){2}[^,]+,([^,]+,)[^,]+'),
+        'replacement': 'MV LUNAR STAR 1 SHIPPING COMPANY LIMITED, C/o Oesterreichischer Lloyd Seereederei (Cyprus) Ltd, 67 Franklin Roosevelt Ave, Limassol, VAT number CY60177359M',
+        'count': 1,
+        'description': 'Updated owner details'
+    },
+    {
+        'field': 'charterer_details',
+        'pattern': _rule(r'(and\s+)[^C]+COMPANY[^S]+SINGAPORE[^S]+SINGAPORE'),
+        'replacement': 'Louis Dreyfus Company Suisse S.A.- Charterers of the City of GVA Center,29 route de l\' Aéroport- P.O. Box 236, 1215 Geneva 15,Switzerland',
+        'count': 1,
+        'description': 'Updated charterer details'
+    },
+    {
+        'field': 'charter_period',
+        'pattern': _rule(r'(about\s+minimum\s+)(\d+)(\s+months\s+to\s+maximum\s+)(\d+)(\s+months[^,]*)'),
+        'replacement': lambda m: 'About 11 to about 14 months (about to mean +/- 15 days in charterer\'s option) at 107.00 % bhsi38 index ( with option to convert to fixed rate) + opt about 10 – about 14 months (about to mean +/ - 15 days in charterer\'s option) at $ 11,500 declarable in charterer\'s option. Optional 10-14 months to be declared by Charterers latest 45 days prior max duration',
+        'count': 1,
+        'description': 'Updated charter period with index rate and optional period'
+    },
+    {
+        'field': 'delivery_port',
+        'pattern': _rule(r'(at\s+on\s+dropping\s+last\s+outward\s+sea\s+pilot\s+)[^(]+(\(intention[^)]*\))'),
+        'replacement': 'Yeosu, subject Sellers port changes',
+        'recap_field': 'delivery_port',
+        'count': 1,
+        'description': 'Updated delivery port'
+    },
+    {
+        'field': 'laycan',
+        'pattern': _rule(r'(WOULD SUGGEST 1 \(ONE\) MONTH AFTER DIVER SURVEY TO BE CARRIED OUT IN YEOSU)'),
+        'replacement': 'Laycan: 3-10 July – it is mutually agreed between both Owners and Charterers that if any adjustment on laycan required, same to be discussed in good faith by both parties',
+        'count': 1,
+        'description': 'Added laycan period'
+    }
+]
+
+# Cache of per-rule match results keyed by base CP text, so repeated merges
+# against the same template skip the regex scan phase entirely
+_BASE_SCAN_CACHE: Dict[int, Tuple[str, List[Tuple[int, int, int, Any]]]] = {}
+_BASE_SCAN_CACHE_SIZE = 8
+
+def _scan_base_text(base_cp_text: str) -> List[Tuple[int, int, int, Any]]:
+    """Find all merge-rule matches in the base text, sorted by offset
+
+    Results are cached by text content; the stored text is compared on a
+    hit to guard against hash collisions.
+    """
+    key = hash(base_cp_text)
+    cached = _BASE_SCAN_CACHE.get(key)
+    if cached is not None and cached[0] == base_cp_text:
+        return cached[1]
+
+    rule_matches = []
+    for rule_idx, rule in enumerate(_MERGE_RULES):
+        if rule.get('count') == 1:
+            # Rule describes a unique location - stop at the first match
+            # instead of scanning the remainder of the document
+            match = rule['pattern'].search(base_cp_text)
+            if match:
+                rule_matches.append((match.start(), match.end(), rule_idx, match))
+            continue
+        for match in rule['pattern'].finditer(base_cp_text):
+            rule_matches.append((match.start(), match.end(), rule_idx, match))
+    rule_matches.sort(key=lambda entry: entry[0])
+
+    if len(_BASE_SCAN_CACHE) >= _BASE_SCAN_CACHE_SIZE:
+        _BASE_SCAN_CACHE.pop(next(iter(_BASE_SCAN_CACHE)))
+    _BASE_SCAN_CACHE[key] = (base_cp_text, rule_matches)
+    return rule_matches
+
+def _iter_content_blocks(content: str, line_re: re.Pattern, max_paragraph_len: int):
+    """Classify content lines into blocks for the document generators
+
+    Yields (kind, text) tuples where kind is a named group of line_re
+    ('marker', 'clause', 'header') or 'body'. Body lines are accumulated
+    in a list and joined once per flush instead of being concatenated
+    line by line, and each line is classified with a single match call.
+    """
+    body_parts: List[str] = []
+    body_len = 0
+
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            if body_parts:
+                yield 'body', " ".join(body_parts)
+                body_parts = []
+                body_len = 0
+            continue
+
+        match = line_re.match(line)
+        if match:
+            if body_parts:
+                yield 'body', " ".join(body_parts)
+                body_parts = []
+                body_len = 0
+            yield match.lastgroup, line
+            continue
+
+        # body_len tracks the joined length exactly: separators only count
+        # between lines, so the flush threshold matches len(" ".join(...))
+        body_len += len(line) + 1 if body_parts else len(line)
+        body_parts.append(line)
+        if body_len > max_paragraph_len:
+            yield 'body', " ".join(body_parts)
+            body_parts = []
+            body_len = 0
+
+    if body_parts:
+        yield 'body', " ".join(body_parts)
+
+def _apply_edits(text: str, edits: List[Tuple[int, int, str]]) -> str:
+    """Rebuild text by splicing (start, end, replacement) edits in one pass
+
+    Edits must be sorted by start offset and non-overlapping; the text is
+    copied exactly once regardless of how many edits are applied.
+    """
+    parts = []
+    position = 0
+    for start, end, replacement in edits:
+        parts.append(text[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(text[position:])
+    return ''.join(parts)
 
 class DocumentProcessor:
     """Handles document processing, text extraction, and merging operations"""
@@ -45,54 +286,102 @@ class DocumentProcessor:
             raise
     
     def _extract_text_from_pdf(self, file_path: str) -> str:
+        """Extract text from PDF, preferring the pypdfium2 C++ backend"""
+        if _pdfium() is not None:
+            try:
+                return self._extract_text_with_pdfium(file_path)
+            except Exception as pdfium_error:
+                self.logger.warning(f"pypdfium2 extraction failed, falling back to PyPDF2: {str(pdfium_error)}")
+        return self._extract_text_with_pypdf2(file_path)
+
+    def _extract_text_with_pdfium(self, file_path: str) -> str:
+        """Extract text from PDF using pypdfium2"""
+        pdf = _pdfium().PdfDocument(file_path)
+        parts = []
+        try:
+            total_pages = len(pdf)
+            self.logger.info(f"Processing PDF with {total_pages} pages via pypdfium2")
+            for page_num in range(total_pages):
+                page_text = pdf[page_num].get_textpage().get_text_range()
+                page_text = page_text.translate(_XML_INCOMPATIBLE_CHARS)
+                if page_text:
+                    parts.append(page_text)
+                    parts.append("\n")
+                else:
+                    self.logger.warning(f"No text found on page {page_num + 1}")
+        finally:
+            pdf.close()
+
+        text = "".join(parts)
+        if not text.strip():
+            return "No readable text found in PDF. The document may be image-based, password-protected, or corrupted."
+
+        return text
+
+    def _extract_text_with_pypdf2(self, file_path: str) -> str:
         """Extract text from PDF using PyPDF2 (safer for complex PDFs)"""
-        if not PDF_LIBS_AVAILABLE:
-            raise ImportError("PDF processing libraries not available")
-        
-        text = ""
-        
+        import PyPDF2
+
+        parts = []
+
         # Use PyPDF2 directly as it's more stable for complex PDFs
         try:
-            if 'PyPDF2' not in globals():
-                raise ImportError("PyPDF2 not available")
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 total_pages = len(pdf_reader.pages)
                 self.logger.info(f"Processing PDF with {total_pages} pages")
-                
-                for page_num in range(total_pages):
-                    try:
-                        page = pdf_reader.pages[page_num]
-                        page_text = page.extract_text()
+
+                if total_pages >= _PARALLEL_PAGE_THRESHOLD:
+                    # Pages are independent, so extract them in parallel
+                    max_workers = min(os.cpu_count() or 1, 4)
+                    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                        page_texts = list(executor.map(
+                            _extract_page, repeat(file_path), range(total_pages)
+                        ))
+                    for page_num, page_text in enumerate(page_texts):
                         if page_text:
-                            text += page_text + "\n"
-                            self.logger.debug(f"Extracted text from page {page_num + 1}")
+                            parts.append(page_text)
+                            parts.append("\n")
                         else:
                             self.logger.warning(f"No text found on page {page_num + 1}")
-                    except Exception as page_error:
-                        self.logger.warning(f"Error extracting text from page {page_num + 1}: {str(page_error)}")
-                        continue
+                else:
+                    # Hoist lookups out of the page loop; %-style logging args
+                    # defer formatting until the record is actually emitted
+                    pages = pdf_reader.pages
+                    append = parts.append
+                    warn = self.logger.warning
+                    debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+                    for page_num in range(total_pages):
+                        try:
+                            page_text = pages[page_num].extract_text()
+                            if page_text:
+                                append(page_text)
+                                append("\n")
+                                if debug_enabled:
+                                    self.logger.debug("Extracted text from page %d", page_num + 1)
+                            else:
+                                warn("No text found on page %d", page_num + 1)
+                        except Exception as page_error:
+                            warn("Error extracting text from page %d: %s", page_num + 1, page_error)
+                            continue
                         
         except Exception as pdf_error:
             self.logger.error(f"PDF extraction failed: {str(pdf_error)}")
             # Return a meaningful message instead of crashing
             return f"PDF content could not be fully extracted. Error: {str(pdf_error)}\n\nPlease ensure the PDF contains extractable text and try again."
         
+        text = "".join(parts)
         if not text.strip():
             return "No readable text found in PDF. The document may be image-based, password-protected, or corrupted."
-            
+
         return text
     
     def _extract_text_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX file"""
         try:
-            if 'Document' not in globals():
-                raise ImportError("python-docx not available")
+            from docx import Document
             doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
         except Exception as e:
             self.logger.error(f"Error extracting DOCX text: {str(e)}")
             raise
@@ -100,30 +389,22 @@ class DocumentProcessor:
     def extract_recap_data(self, file_path: str) -> Dict[str, Any]:
         """Extract structured data from recap document"""
         recap_text = self.extract_text_from_file(file_path)
-        
-        # Define patterns for key information
-        patterns = {
-            'vessel_name': r'MV\s+([A-Z\s\d]+?)(?:\s+ex\s+|IMO|\s+Cyprus)',
-            'imo_number': r'IMO\s+(\d+)',
-            'flag': r'(Cyprus|Liberian|Marshall Islands|Panama)\s+flag',
-            'built_year': r'BLT\s+(\d{4})',
-            'dwt': r'DWT\s+([\d,\']+)',
-            'delivery_port': r'Delivery\s+DLOSP\s+([A-Za-z\s,]+)',
-            'laycan': r'Laycan:\s*([^–\n]+)',
-            'hire_rate': r'at\s+([\d.]+)\s*%\s*bhsi38',
-            'period': r'About\s+(\d+)\s+to\s+about\s+(\d+)\s+months',
-            'optional_period': r'opt\s+about\s+(\d+)\s*[–-]\s*about\s+(\d+)\s+months\s+at\s*\$\s*([\d,]+)',
-            'redelivery_range': r'REDEL\s+DOP\s+1SP\s+WW\s+WITHIN\s+TRADING\s+LIMITS.*?(?=\+|$)',
-            'bunkers_delivery': r'VLSFO\s+ABOUT\s+(\d+)\s+MT\s+AND\s+MGO\s+ABOUT\s+(\d+)\s+MT',
-            'commission': r'Commission:\s*([\d.]+)\s*%?\s*address\s+commission',
-            'charterer': r'LOUIS\s+DREYFUS\s+COMPANY[^+]*',
-            'owner': r'MV\s+LUNAR\s+STAR\s+1\s+SHIPPING\s+COMPANY[^+]*',
-        }
-        
+
         extracted_data = {}
-        
-        for key, pattern in patterns.items():
-            match = re.search(pattern, recap_text, re.IGNORECASE | re.DOTALL)
+
+        # The patterns are independent, so large recaps can run the searches
+        # on a thread pool; each scan is mostly C code over the same buffer
+        if len(recap_text) >= _PARALLEL_RECAP_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {
+                    key: executor.submit(pattern.search, recap_text)
+                    for key, pattern in _RECAP_PATTERNS.items()
+                }
+                matches = {key: future.result() for key, future in futures.items()}
+        else:
+            matches = {key: pattern.search(recap_text) for key, pattern in _RECAP_PATTERNS.items()}
+
+        for key, match in matches.items():
             if match:
                 try:
                     if key == 'period':
@@ -141,135 +422,82 @@ class DocumentProcessor:
                     # If group doesn't exist, use the full match
                     extracted_data[key] = match.group(0).strip()
         
-        # Extract trading exclusions
-        trading_section = re.search(r'TRADING EXCLUSIONS(.*?)(?=\+|$)', recap_text, re.IGNORECASE | re.DOTALL)
-        if trading_section:
-            extracted_data['trading_exclusions'] = trading_section.group(1).strip()
-        
-        # Extract hire payment details
-        hire_section = re.search(r'Hire payment clause:(.*?)(?=Conversion|For subsequent)', recap_text, re.IGNORECASE | re.DOTALL)
-        if hire_section:
-            extracted_data['hire_payment'] = hire_section.group(1).strip()
-        
+        # Extract trading exclusions and hire payment details in a single scan
+        for section in _RECAP_SECTIONS_RE.finditer(recap_text):
+            if section.group('trading') is not None:
+                if 'trading_exclusions' not in extracted_data:
+                    extracted_data['trading_exclusions'] = section.group('trading').strip()
+            elif 'hire_payment' not in extracted_data:
+                extracted_data['hire_payment'] = section.group('hire').strip()
+
         return extracted_data
     
-    def merge_documents(self, base_cp_text: str, recap_data: Dict[str, Any], change_tracker) -> Tuple[str, List[Dict]]:
+    def merge_documents(self, base_cp_text: str, recap_data: Dict[str, Any], change_tracker) -> Tuple[str, List[Change]]:
         """Merge recap data into base CP template and track changes"""
-        merged_text = base_cp_text
         changes = []
+
         
-        # Define mapping rules for merging recap data into CP
-        merge_rules = [
-            {
-                'field': 'charter_date',
-                'pattern': r'(made and concluded in\s+\w+\s+)(\d+)(th|st|nd|rd)(\s+day of\s+\w+\s+19\s+)(\d+)',
-                'replacement': lambda m: f"{m.group(1)}10{m.group(3)}{m.group(4).replace('May', 'June')}2025",
-                'description': 'Updated charter date to June 10, 2025'
-            },
-            {
-                'field': 'vessel_name',
-                'pattern': r'(Steamship/Motorship\s+")([^"]+)(")',
-                'replacement': lambda m: f'{m.group(1)}LUNAR STAR 1{m.group(3)}',
-                'recap_field': 'vessel_name',
-                'description': 'Updated vessel name'
-            },
-            {
-                'field': 'owner_details',
-                'pattern': r'(Between\s+)[^,]+,([^,]+,){2}[^,]+,([^,]+,)[^,]+',
-                'replacement': 'MV LUNAR STAR 1 SHIPPING COMPANY LIMITED, C/o Oesterreichischer Lloyd Seereederei (Cyprus) Ltd, 67 Franklin Roosevelt Ave, Limassol, VAT number CY60177359M',
-                'description': 'Updated owner details'
-            },
-            {
-                'field': 'charterer_details',
-                'pattern': r'(and\s+)[^C]+COMPANY[^S]+SINGAPORE[^S]+SINGAPORE',
-                'replacement': 'Louis Dreyfus Company Suisse S.A.- Charterers of the City of GVA Center,29 route de l\' Aéroport- P.O. Box 236, 1215 Geneva 15,Switzerland',
-                'description': 'Updated charterer details'
-            },
-            {
-                'field': 'charter_period',
-                'pattern': r'(about\s+minimum\s+)(\d+)(\s+months\s+to\s+maximum\s+)(\d+)(\s+months[^,]*)',
-                'replacement': lambda m: 'About 11 to about 14 months (about to mean +/- 15 days in charterer\'s option) at 107.00 % bhsi38 index ( with option to convert to fixed rate) + opt about 10 – about 14 months (about to mean +/ - 15 days in charterer\'s option) at $ 11,500 declarable in charterer\'s option. Optional 10-14 months to be declared by Charterers latest 45 days prior max duration',
-                'description': 'Updated charter period with index rate and optional period'
-            },
-            {
-                'field': 'delivery_port',
-                'pattern': r'(at\s+on\s+dropping\s+last\s+outward\s+sea\s+pilot\s+)[^(]+(\(intention[^)]*\))',
-                'replacement': 'Yeosu, subject Sellers port changes',
-                'recap_field': 'delivery_port',
-                'description': 'Updated delivery port'
-            },
-            {
-                'field': 'laycan',
-                'pattern': r'(WOULD SUGGEST 1 \(ONE\) MONTH AFTER DIVER SURVEY TO BE CARRIED OUT IN YEOSU)',
-                'replacement': 'Laycan: 3-10 July – it is mutually agreed between both Owners and Charterers that if any adjustment on laycan required, same to be discussed in good faith by both parties',
-                'description': 'Added laycan period'
-            }
-        ]
-        
-        # Apply merge rules
-        for rule in merge_rules:
-            pattern = rule['pattern']
-            
-            if 'replacement' in rule:
-                if callable(rule['replacement']):
-                    # Function-based replacement
-                    def replace_func(match):
-                        old_text = match.group(0)
-                        new_text = rule['replacement'](match)
-                        changes.append(change_tracker.track_change(
-                            rule['field'], old_text, new_text, rule['description']
-                        ))
-                        return new_text
-                    
-                    merged_text = re.sub(pattern, replace_func, merged_text, flags=re.IGNORECASE)
-                else:
-                    # String-based replacement
-                    match = re.search(pattern, merged_text, re.IGNORECASE)
-                    if match:
-                        old_text = match.group(0)
-                        new_text = rule['replacement']
-                        changes.append(change_tracker.track_change(
-                            rule['field'], old_text, new_text, rule['description']
-                        ))
-                        merged_text = re.sub(pattern, new_text, merged_text, flags=re.IGNORECASE)
+        # Apply merge rules: collect every rule's matches against the immutable
+        # base text in one (cached) scan phase, then splice all replacements in
+        # a single pass instead of rewriting the document once per rule
+        edits: List[Tuple[int, int, str]] = []
+        track_change = change_tracker.track_change
+        record_change = changes.append
+        add_edit = edits.append
+        last_end = 0
+        for start, end, rule_idx, match in _scan_base_text(base_cp_text):
+            if start < last_end:
+                # Overlapping match from a later rule - first rule wins
+                continue
+            rule = _MERGE_RULES[rule_idx]
+            old_text = match.group(0)
+            replacement = rule['replacement']
+            new_text = replacement(match) if callable(replacement) else replacement
+            record_change(track_change(
+                rule['field'], old_text, new_text, rule['description']
+            ))
+            add_edit((start, end, new_text))
+            last_end = end
+        merged_text = _apply_edits(base_cp_text, edits)
         
         # Add special clauses from recap
         if 'trading_exclusions' in recap_data:
             # Find location to insert trading exclusions
-            exclusion_pattern = r'(as the Charterers or their Agents shall direct, on the following conditions:)'
-            if re.search(exclusion_pattern, merged_text):
+            exclusion_pattern = r'as the Charterers or their Agents shall direct, on the following conditions:'
+            anchor = re.search(exclusion_pattern, merged_text)
+            if anchor:
                 trading_exclusions = f"\n\nTRADING EXCLUSIONS:\n{recap_data['trading_exclusions']}\n"
-                merged_text = re.sub(exclusion_pattern, r'\1' + trading_exclusions, merged_text)
+                merged_text = _apply_edits(
+                    merged_text, [(anchor.end(), anchor.end(), trading_exclusions)]
+                )
                 changes.append(change_tracker.track_change(
                     'trading_exclusions', '', trading_exclusions, 'Added trading exclusions clause'
                 ))
-        
+
         # Add dry-docking clause
         dd_clause = "\n\nDRY-DOCKING CLAUSE:\nDry-docking / SS Oct - early Nov 25 in China or Med/Black Sea/Portugal, duration 10-15 days. DD location (med or China) is in Charterer's option. Charterers to place the vessel into either Med Sea / Black Sea range or Singapore - Japan range for owners to take over for DD.\n"
-        merged_text += dd_clause
         changes.append(change_tracker.track_change(
             'dry_docking', '', dd_clause, 'Added dry-docking clause'
         ))
-        
+
         # Add summary of changes section
-        summary_section = "\n\n=== SUMMARY OF CHANGES ===\n"
+        summary_parts = ["\n\n=== SUMMARY OF CHANGES ===\n"]
         if changes:
-            summary_section += "The following modifications were made to the base Charter Party:\n\n"
+            summary_parts.append("The following modifications were made to the base Charter Party:\n\n")
             for i, change in enumerate(changes, 1):
-                summary_section += f"{i}. {change['description']}\n"
-            summary_section += "\n=== END SUMMARY ===\n"
+                summary_parts.append(f"{i}. {change.description}\n")
+            summary_parts.append("\n=== END SUMMARY ===\n")
         else:
-            summary_section += "No changes were made to the base Charter Party document.\n=== END SUMMARY ===\n"
-        
-        merged_text += summary_section
-        
+            summary_parts.append("No changes were made to the base Charter Party document.\n=== END SUMMARY ===\n")
+
+        merged_text = ''.join([merged_text, dd_clause] + summary_parts)
+
         return merged_text, changes
     
     def generate_docx(self, content: str, output_path: str):
         """Generate DOCX file from merged content"""
         try:
-            if not PDF_LIBS_AVAILABLE or 'Document' not in globals():
-                raise ImportError("python-docx not available")
+            from docx import Document
             doc = Document()
             
             # Add title and header
@@ -282,62 +510,23 @@ class DocumentProcessor:
             doc.add_paragraph()
             
             # Process the content more intelligently
-            lines = content.split('\n')
-            current_paragraph = ""
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    # Empty line - finish current paragraph and add spacing
-                    if current_paragraph:
-                        self._add_formatted_paragraph(doc, current_paragraph)
-                        current_paragraph = ""
-                    continue
-                
-                # Check for special sections
-                if line.startswith('==='):
+            for kind, block in _iter_content_blocks(content, _DOCX_BLOCK_RE, 500):
+                if kind == 'marker':
                     # Summary section
-                    if current_paragraph:
-                        self._add_formatted_paragraph(doc, current_paragraph)
-                        current_paragraph = ""
-                    if 'SUMMARY OF CHANGES' in line:
+                    if 'SUMMARY OF CHANGES' in block:
                         doc.add_page_break()
                         doc.add_heading('Summary of Changes', level=1)
-                    elif 'END SUMMARY' in line:
+                    elif 'END SUMMARY' in block:
                         doc.add_paragraph()
-                    continue
-                
-                # Check for numbered clauses (1., 2., etc.)
-                if re.match(r'^\d+\.\s', line):
-                    if current_paragraph:
-                        self._add_formatted_paragraph(doc, current_paragraph)
-                        current_paragraph = ""
-                    doc.add_heading(line, level=2)
-                    continue
-                
-                # Check for clause headers (That the...)
-                if line.startswith('That the') and len(line) > 50:
-                    if current_paragraph:
-                        self._add_formatted_paragraph(doc, current_paragraph)
-                        current_paragraph = ""
-                    doc.add_heading(line, level=3)
-                    continue
-                
-                # Regular content - accumulate in current paragraph
-                if current_paragraph:
-                    current_paragraph += " " + line
+                elif kind == 'clause':
+                    # Numbered clauses (1., 2., etc.)
+                    doc.add_heading(block, level=2)
+                elif kind == 'header':
+                    # Clause headers (That the...)
+                    doc.add_heading(block, level=3)
                 else:
-                    current_paragraph = line
-                
-                # If paragraph is getting too long, break it
-                if len(current_paragraph) > 500:
-                    self._add_formatted_paragraph(doc, current_paragraph)
-                    current_paragraph = ""
-            
-            # Add any remaining content
-            if current_paragraph:
-                self._add_formatted_paragraph(doc, current_paragraph)
-            
+                    self._add_formatted_paragraph(doc, block)
+
             doc.save(output_path)
             self.logger.info(f"DOCX file saved to: {output_path}")
             
@@ -347,30 +536,44 @@ class DocumentProcessor:
     
     def _add_formatted_paragraph(self, doc, text):
         """Add a formatted paragraph to the document"""
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
+
         if not text.strip():
             return
-        
+
         # Clean up the text
         text = text.strip()
-        
-        # Check if this looks like a list item
-        if re.match(r'^\d+\)\s|^[a-z]\)\s|^•\s|^-\s', text):
-            p = doc.add_paragraph(text, style='List Bullet')
+
+        # Build the <w:p> element directly and splice it into the body,
+        # bypassing python-docx's per-paragraph style resolution; the
+        # properties block is cloned from a per-style cached template.
+        # List items get the bullet style, as before
+        style = 'ListBullet' if _LIST_ITEM_RE.match(text) else None
+        paragraph = OxmlElement('w:p')
+        paragraph.append(deepcopy(_paragraph_props(style)))
+        run = OxmlElement('w:r')
+        text_el = OxmlElement('w:t')
+        text_el.set(qn('xml:space'), 'preserve')
+        text_el.text = text
+        run.append(text_el)
+        paragraph.append(run)
+
+        # Keep the section properties element last, as Word requires
+        body = doc.element.body
+        sect_pr = body.find(qn('w:sectPr'))
+        if sect_pr is not None:
+            sect_pr.addprevious(paragraph)
         else:
-            p = doc.add_paragraph(text)
-        
-        # Add some spacing after paragraphs
-        from docx.shared import Pt
-        try:
-            p.paragraph_format.space_after = Pt(6)
-        except:
-            pass  # Skip if formatting fails
+            body.append(paragraph)
     
     def generate_pdf(self, content: str, output_path: str):
         """Generate PDF file from merged content"""
         try:
-            if not PDF_LIBS_AVAILABLE:
-                raise ImportError("reportlab not available")
+            from reportlab.lib.pagesizes import letter
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
             doc = SimpleDocTemplate(output_path, pagesize=letter)
             styles = getSampleStyleSheet()
             
@@ -422,51 +625,18 @@ class DocumentProcessor:
             story.append(Spacer(1, 12))
             
             # Process content more intelligently
-            lines = content.split('\n')
-            current_paragraph = ""
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    # Empty line - finish current paragraph
-                    if current_paragraph:
-                        self._add_pdf_paragraph(story, current_paragraph, normal_style, section_style)
-                        current_paragraph = ""
-                    continue
-                
-                # Skip summary markers
-                if line.startswith('==='):
-                    if current_paragraph:
-                        self._add_pdf_paragraph(story, current_paragraph, normal_style, section_style)
-                        current_paragraph = ""
-                    if 'SUMMARY OF CHANGES' in line:
+            for kind, block in _iter_content_blocks(content, _PDF_BLOCK_RE, 800):
+                if kind == 'marker':
+                    # Skip summary markers
+                    if 'SUMMARY OF CHANGES' in block:
                         story.append(Spacer(1, 20))
                         story.append(Paragraph("Summary of Changes", section_style))
-                    continue
-                
-                # Check for numbered clauses
-                if re.match(r'^\d+\.\s', line):
-                    if current_paragraph:
-                        self._add_pdf_paragraph(story, current_paragraph, normal_style, section_style)
-                        current_paragraph = ""
-                    story.append(Paragraph(line, section_style))
-                    continue
-                
-                # Accumulate regular content
-                if current_paragraph:
-                    current_paragraph += " " + line
+                elif kind == 'clause':
+                    # Numbered clauses
+                    story.append(Paragraph(block, section_style))
                 else:
-                    current_paragraph = line
-                
-                # Break very long paragraphs
-                if len(current_paragraph) > 800:
-                    self._add_pdf_paragraph(story, current_paragraph, normal_style, section_style)
-                    current_paragraph = ""
-            
-            # Add any remaining content
-            if current_paragraph:
-                self._add_pdf_paragraph(story, current_paragraph, normal_style, section_style)
-            
+                    self._add_pdf_paragraph(story, block, normal_style, section_style)
+
             doc.build(story)
             self.logger.info(f"PDF file saved to: {output_path}")
             
@@ -476,12 +646,14 @@ class DocumentProcessor:
     
     def _add_pdf_paragraph(self, story, text, normal_style, section_style):
         """Add a paragraph to the PDF story with appropriate formatting"""
+        from reportlab.platypus import Paragraph
+
         if not text.strip():
             return
         
-        # Clean up text
-        text = text.strip()
-        text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+        # Clean up text: str.split with no arguments tokenizes on whitespace
+        # at C speed, so this normalizes without touching the regex engine
+        text = ' '.join(text.split())
         
         # Check if it's a special section
         if text.startswith('That the') and len(text) > 50:
@@ -0,0 +1,23 @@
+import os
+
+from document_processor import DocumentProcessor
+
+FIXTURE_PDF = os.path.join(os.path.dirname(__file__), 'uploads', 'test_base_cp.pdf')
+
+
+def test_pdfium_extraction_is_xml_compatible():
+    """Extracted PDF text must not carry characters lxml rejects"""
+    text = DocumentProcessor().extract_text_from_file(FIXTURE_PDF)
+    assert text.strip()
+    assert '￾' not in text and '￿' not in text
+    assert all(ch in '\t\n\r' or ord(ch) >= 0x20 for ch in text)
+
+
+def test_extracted_pdf_round_trips_through_docx(tmp_path):
+    """Text extracted from the fixture PDF must survive DOCX generation"""
+    processor = DocumentProcessor()
+    text = processor.extract_text_from_file(FIXTURE_PDF)
+    output_path = str(tmp_path / 'round_trip.docx')
+    processor.generate_docx(text, output_path)
+    round_tripped = processor.extract_text_from_file(output_path)
+    assert 'Time Charter Party' in round_tripped